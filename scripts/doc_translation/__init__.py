@@ -0,0 +1,23 @@
+"""
+Corpus-wide French to American English translation of the Markdown documentation.
+
+The rule tables stay in the legacy ``translate_*.py`` scripts; this package loads
+them without executing the scripts and applies them to a whole corpus at once.
+
+Usage (from the ``scripts`` directory):
+
+    python -m doc_translation translate --root /workspaces/proxy
+"""
+
+from .anchors import AnchorIndex, slugify
+from .engine import translate
+from .rules import LEGACY_SEQUENCE, Rule, load_legacy_rules
+
+__all__ = [
+    "AnchorIndex",
+    "LEGACY_SEQUENCE",
+    "Rule",
+    "load_legacy_rules",
+    "slugify",
+    "translate",
+]
@@ -0,0 +1,357 @@
+"""Command line entry point: ``python -m doc_translation <command>``."""
+
+import argparse
+import functools
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from .corpus import DEFAULT_PATTERNS, REPO_ROOT, iter_files, read_text, relative, translate_corpus
+from .domains import COMMON, DOMAINS, DomainGlossary, load_domain
+from .equivalence import EquivalenceRunner
+from .glossary import load_glossary, save_glossary
+from .lint import KINDS, lint, prune
+from .pipeline import PipelineOptions, translate_corpus_async
+from .regex_safety import TimeBudget, UnsafePatternError, check_rules
+from .rules import load_legacy_rules, load_powershell_rules
+from .shard import load_bundles, merge_bundles, parse_shard, run_shard, save_bundle
+from .trie import Trie, TrieBuilder, iter_csv, iter_tmx, trie_rule
+
+PACKAGE_PARENT = Path(__file__).resolve().parent.parent
+
+
+def rule_loader(args, default=DomainGlossary):
+    """Picklable loader of the rule set selected on the command line."""
+    if args.glossary:
+        return functools.partial(load_glossary, args.glossary)
+    if args.powershell:
+        return load_powershell_rules
+    if args.legacy:
+        return load_legacy_rules
+    if args.trie:
+        return functools.partial(list, [trie_rule(args.trie)])
+    if getattr(args, "domain", None):
+        return functools.partial(load_domain, args.domain)
+    return default
+
+
+def time_budget(args):
+    """``TimeBudget`` from ``--rule-budget``/``--file-budget`` (milliseconds), or ``None``."""
+    if args.rule_budget is None and args.file_budget is None:
+        return None
+    return TimeBudget(
+        per_rule=args.rule_budget / 1000 if args.rule_budget is not None else None,
+        per_file=args.file_budget / 1000 if args.file_budget is not None else None,
+    )
+
+
+def print_budget_errors(errors):
+    """Print ``(path, scope, rule, line, excerpt)`` of the files skipped over their budget."""
+    for path, scope, rule, line, excerpt in errors:
+        span = f"{path}:{line} {excerpt[:70]!r}" if line else f"{path} (span unknown)"
+        print(f"  ❌ {span}: {scope} budget exceeded by {rule}, file skipped")
+
+
+def load_documents(args):
+    root = Path(args.root)
+    return [(relative(root, path), read_text(path)) for path in iter_files(root, args.pattern or DEFAULT_PATTERNS)]
+
+
+def run_translate(args):
+    patterns = args.pattern or DEFAULT_PATTERNS
+    if args.pipeline:
+        options = PipelineOptions(args.readers, args.workers, args.writers, args.queue_size)
+        print(f"Translating corpus under {args.root} ({options})...")
+        report = translate_corpus_async(args.root, patterns, args.dry_run, options, rule_loader(args),
+                                        time_budget(args))
+    else:
+        print(f"Translating corpus under {args.root}...")
+        report = translate_corpus(args.root, rule_loader(args)(), patterns, args.dry_run, time_budget(args))
+    for path, fired in sorted(report.translated.items()):
+        print(f"  ✓ {path} ({len(fired)} rules)")
+    for (path, old_slug), new_slug in report.anchors:
+        print(f"  ✓ {path}#{old_slug} → #{new_slug}")
+    for path, count in sorted(report.links.items()):
+        print(f"  ✓ {path}: {count} links rewritten")
+    print(f"\n✅ Applied {report.rules_applied} translations to {len(report.translated)} files")
+    print(f"✅ Renamed {len(report.anchors)} anchors, rewrote {report.links_rewritten} links")
+    print_budget_errors(sorted(
+        (error.path, error.scope, error.source, error.line, error.excerpt) for error in report.budget_errors
+    ))
+    if args.dry_run:
+        print("ℹ️ Dry run: no file written")
+    return 1 if report.budget_errors else 0
+
+
+def run_lint(args):
+    rules = rule_loader(args, load_legacy_rules)()
+    documents = load_documents(args)
+    print(f"Linting {len(rules)} rules against {len(documents)} documents...")
+    findings = lint(rules, documents)
+    for kind in KINDS:
+        selected = [finding for finding in findings if finding.kind == kind]
+        if not selected:
+            continue
+        print(f"\n⚠️ {len(selected)} {kind} rules:")
+        for finding in selected:
+            other = f" ← {finding.other.source}" if finding.other else ""
+            print(f"  - {finding.rule.source} {finding.rule.pattern[:50]!r}{other}: {finding.detail}")
+    if not findings:
+        print("\n✅ No issue found")
+    return 1 if findings else 0
+
+
+def run_compile(args):
+    rules, _ = check_rules(rule_loader(args, load_legacy_rules)())
+    pruned = set()
+    if args.prune:
+        rules, pruned = prune(rules, lint(rules, load_documents(args)))
+    save_glossary(args.output, rules, pruned)
+    print(f"✅ Compiled {len(rules)} rules into {args.output} ({len(pruned)} dead rules pruned)")
+    return 0
+
+
+def run_shard_command(args):
+    index, count = args.shard
+    bundle = run_shard(args.root, rule_loader(args)(), index, count, args.pattern or DEFAULT_PATTERNS,
+                       time_budget(args))
+    save_bundle(args.output, bundle)
+    metrics = bundle["metrics"]
+    print(f"✅ Shard {index}/{count}: {metrics['translated']}/{metrics['files']} files translated "
+          f"in {metrics['seconds']}s → {args.output}")
+    print_budget_errors(
+        (error["path"], error["scope"], error["rule"], error["line"], error["excerpt"])
+        for error in bundle["budget_errors"]
+    )
+    return 0
+
+
+def merge(args, bundle_paths):
+    try:
+        report, combined = merge_bundles(args.root, load_bundles(bundle_paths), args.dry_run)
+    except ValueError as error:
+        print(f"❌ {error}")
+        return 1
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(combined, f, ensure_ascii=False, indent=2)
+    metrics = combined["metrics"]
+    print(f"✅ Merged {combined['shards']} shards: {metrics['translated']} files translated, "
+          f"{metrics['rules_applied']} translations")
+    print(f"✅ Renamed {combined['anchors_renamed']} anchors, rewrote {combined['links_rewritten']} links")
+    if combined["residual"]:
+        print(f"⚠️ Residual French words in {len(combined['residual'])} files")
+    for path in combined["conflicts"]:
+        print(f"  ❌ {path} changed since it was sharded, edit skipped")
+    print_budget_errors(
+        (error["path"], error["scope"], error["rule"], error["line"], error["excerpt"])
+        for error in combined["budget_errors"]
+    )
+    if args.dry_run:
+        print("ℹ️ Dry run: no file written")
+    return 1 if combined["conflicts"] or combined["budget_errors"] else 0
+
+
+def run_merge(args):
+    return merge(args, args.bundles)
+
+
+def run_local_shards(args):
+    """Run the N shards as N local processes, then merge their bundles."""
+    forwarded = ["--root", args.root]
+    for pattern in args.pattern or ():
+        forwarded += ["--pattern", pattern]
+    if args.glossary:
+        forwarded += ["--glossary", args.glossary]
+    elif args.powershell:
+        forwarded.append("--powershell")
+    elif args.legacy:
+        forwarded.append("--legacy")
+    elif args.trie:
+        forwarded += ["--trie", args.trie]
+    for option in ("rule_budget", "file_budget"):
+        if getattr(args, option) is not None:
+            forwarded += ["--" + option.replace("_", "-"), str(getattr(args, option))]
+    with tempfile.TemporaryDirectory(prefix="doc-shards-") as directory:
+        bundles = [str(Path(directory) / f"shard-{index}.json") for index in range(args.shards)]
+        processes = [
+            subprocess.Popen(
+                [sys.executable, "-m", "doc_translation", "shard", "--shard", f"{index}/{args.shards}",
+                 "--output", bundle, *forwarded],
+                cwd=PACKAGE_PARENT,
+            )
+            for index, bundle in enumerate(bundles)
+        ]
+        if any(process.wait() for process in processes):
+            print("❌ At least one shard failed")
+            return 1
+        return merge(args, bundles)
+
+
+def run_equivalence(args):
+    runner = EquivalenceRunner(rule_loader(args, load_legacy_rules)())
+    if args.check_cut_points:
+        failures = runner.check_cut_points(args.root, args.pattern or DEFAULT_PATTERNS)
+        for path, script, line in failures:
+            print(f"  ❌ {path}: cutting {script} at line {line} diverges")
+        if failures:
+            print(f"\n❌ {len(failures)} cut points diverge, bisection would blame the wrong entry")
+            return 1
+        print("✅ No cut point diverges")
+        return 0
+    report = runner.run(args.root, args.pattern or DEFAULT_PATTERNS)
+    for comparison in report.files:
+        mark = "✓" if comparison.identical else "❌"
+        print(f"  {mark} {comparison.path}: ×{comparison.speedup:.1f} "
+              f"({comparison.legacy_seconds * 1000:.1f} ms → {comparison.engine_seconds * 1000:.1f} ms)")
+        if not comparison.identical:
+            print(f"      diverges in {comparison.stage}, rule {comparison.rule}")
+            difference = comparison.first_difference
+            print(f"      line {difference['line']}: legacy {difference['legacy'][:70]!r}")
+            print(f"      line {difference['line']}: engine {difference['engine'][:70]!r}")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump([dict(vars(c), speedup=c.speedup) for c in report.files], f, ensure_ascii=False, indent=2)
+    identical = len(report.files) - len(report.divergent)
+    print(f"\n✅ {identical}/{len(report.files)} files byte-identical, overall speedup ×{report.speedup:.1f}")
+    if report.divergent:
+        print(f"❌ {len(report.divergent)} files diverge")
+    return 1 if report.divergent else 0
+
+
+def run_import(args):
+    builder = TrieBuilder()
+    for path in args.tmx or ():
+        builder.update(iter_tmx(path, args.source_lang, args.target_lang))
+    for path in args.csv or ():
+        builder.update(iter_csv(path, args.source_column, args.target_column, args.header, args.delimiter))
+    nodes = builder.write(args.output)
+    trie = Trie(args.output)
+    print(f"✅ Imported {trie.entries} entries into {args.output} "
+          f"({nodes} nodes, {trie.size / 1_000_000:.1f} MB)")
+    return 0
+
+
+def shard_argument(text):
+    try:
+        return parse_shard(text)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error))
+
+
+def add_rule_arguments(parser, domain=False):
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--glossary", help="compiled glossary artifact")
+    source.add_argument("--powershell", action="store_true", help="use the PowerShell script table")
+    source.add_argument("--legacy", action="store_true", help="use the legacy scripts tables for every file")
+    source.add_argument("--trie", help="trie glossary built by import-tm")
+    if domain:
+        names = [d.name for d in DOMAINS] + [COMMON]
+        source.add_argument("--domain", choices=names, help="use the glossary of one domain")
+
+
+def add_budget_arguments(parser):
+    budget = parser.add_argument_group("time budgets (files over budget are skipped and reported)")
+    budget.add_argument("--rule-budget", type=float, metavar="MS", help="milliseconds allowed per rule and file")
+    budget.add_argument("--file-budget", type=float, metavar="MS", help="milliseconds allowed per file")
+
+
+def add_corpus_arguments(parser):
+    parser.add_argument("--root", default=str(REPO_ROOT), help="corpus root (default: repository root)")
+    parser.add_argument("--pattern", action="append", help="glob of the corpus files (repeatable)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="doc_translation", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    translate = commands.add_parser("translate", help="translate the corpus and repair its links")
+    add_corpus_arguments(translate)
+    add_rule_arguments(translate)
+    translate.add_argument("--dry-run", action="store_true", help="report without writing any file")
+    add_budget_arguments(translate)
+    pipeline = translate.add_argument_group("asynchronous pipeline (slow filesystems)")
+    defaults = PipelineOptions()
+    pipeline.add_argument("--pipeline", action="store_true",
+                          help="overlap reads, translation and writes through bounded queues")
+    pipeline.add_argument("--readers", type=int, default=defaults.readers, help="concurrent file reads")
+    pipeline.add_argument("--workers", type=int, default=defaults.workers, help="translation processes")
+    pipeline.add_argument("--writers", type=int, default=defaults.writers, help="concurrent file writes")
+    pipeline.add_argument("--queue-size", type=int, default=defaults.queue_size,
+                          help="capacity of each queue between stages")
+    translate.set_defaults(handler=run_translate)
+
+    lint_parser = commands.add_parser("lint", help="report unsafe, shadowed, dead, hazardous and cascading rules")
+    add_corpus_arguments(lint_parser)
+    add_rule_arguments(lint_parser, domain=True)
+    lint_parser.set_defaults(handler=run_lint)
+
+    compile_parser = commands.add_parser("compile", help="write a compiled glossary artifact")
+    add_corpus_arguments(compile_parser)
+    add_rule_arguments(compile_parser, domain=True)
+    compile_parser.add_argument("--output", required=True, help="artifact path (JSON)")
+    compile_parser.add_argument("--prune", action="store_true", help="leave out the rules dead on the corpus")
+    compile_parser.set_defaults(handler=run_compile)
+
+    shard_parser = commands.add_parser("shard", help="translate one shard into a result bundle")
+    add_corpus_arguments(shard_parser)
+    add_rule_arguments(shard_parser)
+    shard_parser.add_argument("--shard", type=shard_argument, required=True, help="i/N, 0-based")
+    shard_parser.add_argument("--output", required=True, help="result bundle path (JSON)")
+    add_budget_arguments(shard_parser)
+    shard_parser.set_defaults(handler=run_shard_command)
+
+    merge_parser = commands.add_parser("merge", help="merge shard bundles and apply their edits")
+    merge_parser.add_argument("bundles", nargs="+", help="result bundles of every shard")
+    merge_parser.add_argument("--root", default=str(REPO_ROOT), help="corpus root (default: repository root)")
+    merge_parser.add_argument("--report", help="combined report path (JSON)")
+    merge_parser.add_argument("--dry-run", action="store_true", help="report without writing any file")
+    merge_parser.set_defaults(handler=run_merge)
+
+    local_parser = commands.add_parser("shard-local", help="run N shards as local processes and merge them")
+    add_corpus_arguments(local_parser)
+    add_rule_arguments(local_parser)
+    local_parser.add_argument("--shards", type=int, required=True, help="number of shard processes")
+    local_parser.add_argument("--report", help="combined report path (JSON)")
+    local_parser.add_argument("--dry-run", action="store_true", help="report without writing any file")
+    add_budget_arguments(local_parser)
+    local_parser.set_defaults(handler=run_local_shards)
+
+    equivalence_parser = commands.add_parser(
+        "equivalence", help="compare the engine with the legacy scripts on copies of the corpus")
+    add_corpus_arguments(equivalence_parser)
+    add_rule_arguments(equivalence_parser)
+    equivalence_parser.add_argument("--report", help="per-file report path (JSON)")
+    equivalence_parser.add_argument(
+        "--check-cut-points", action="store_true",
+        help="self-check of the bisection: no cut point of the legacy tables may diverge (slow, "
+             "use --pattern to select a few files)")
+    equivalence_parser.set_defaults(handler=run_equivalence)
+
+    import_parser = commands.add_parser("import-tm", help="stream TMX/CSV translation memories into a trie")
+    import_parser.add_argument("--tmx", action="append", help="TMX file (repeatable)")
+    import_parser.add_argument("--csv", action="append", help="CSV file (repeatable)")
+    import_parser.add_argument("--output", required=True, help="trie file path")
+    import_parser.add_argument("--source-lang", default="fr", help="TMX source language (default: fr)")
+    import_parser.add_argument("--target-lang", default="en", help="TMX target language (default: en)")
+    import_parser.add_argument("--source-column", type=int, default=0, help="CSV source column (default: 0)")
+    import_parser.add_argument("--target-column", type=int, default=1, help="CSV target column (default: 1)")
+    import_parser.add_argument("--header", action="store_true", help="skip the first CSV row")
+    import_parser.add_argument("--delimiter", default=",", help="CSV delimiter (default: ,)")
+    import_parser.set_defaults(handler=run_import)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except UnsafePatternError as error:
+        print(f"❌ {error}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
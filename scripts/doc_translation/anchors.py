@@ -0,0 +1,173 @@
+"""
+Heading anchor index: remember which heading slugs a translation renamed, then
+rewrite the intra-repo Markdown links pointing at them.
+
+Translating "Documentation des Interfaces" into "Interfaces Documentation" turns
+``#documentation-des-interfaces`` into ``#interfaces-documentation``; every link
+using the old fragment would otherwise be left dangling.
+"""
+
+import posixpath
+import re
+import unicodedata
+from urllib.parse import quote, unquote
+
+HEADING_RE = re.compile(r"^ {0,3}(#{1,6})[ \t]+(.*?)[ \t]*#*[ \t]*$")
+FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+INLINE_LINK_RE = re.compile(r"(\]\(\s*<?)([^()\s#<>]*)#([^()\s<>]+)")
+REFERENCE_LINK_RE = re.compile(r"^(\s{0,3}\[[^\]]+\]:\s*<?)([^\s#<>]*)#(\S+?)(?=>|\s|$)")
+LINK_RES = (REFERENCE_LINK_RE, INLINE_LINK_RE)
+SCHEME_RE = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*:")
+
+
+def slugify(text):
+    """GitHub-style anchor of a heading text (without the duplicate suffix)."""
+    text = re.sub(r"!?\[([^\]]*)\]\([^)]*\)", r"\1", text)
+    text = text.replace("`", "").replace("*", "")
+    text = unicodedata.normalize("NFC", text.strip().lower())
+    kept = [
+        char for char in text
+        if char in " -_" or unicodedata.category(char)[0] in "LMN"
+    ]
+    return "".join(kept).replace(" ", "-")
+
+
+def iter_prose_lines(content):
+    """Yield ``(index, line)`` for every line outside fenced code blocks."""
+    fence = None
+    for index, line in enumerate(content.split("\n")):
+        match = FENCE_RE.match(line)
+        if fence:
+            closing = match and not line[match.end():].strip()
+            if closing and match.group(1)[0] == fence[0] and len(match.group(1)) >= len(fence):
+                fence = None
+            continue
+        if match:
+            fence = match.group(1)
+            continue
+        yield index, line
+
+
+def extract_headings(content):
+    """Return ``{line_index: slug}`` for the ATX headings of a document."""
+    headings = {}
+    seen = {}
+    for index, line in iter_prose_lines(content):
+        match = HEADING_RE.match(line)
+        if not match:
+            continue
+        slug = slugify(match.group(2))
+        count = seen.get(slug, 0)
+        seen[slug] = count + 1
+        headings[index] = f"{slug}-{count}" if count else slug
+    return headings
+
+
+def renamed_anchors(before, after):
+    """Return the ``(old_slug, new_slug)`` pairs renamed between two versions.
+
+    Translations replace text within lines, so headings are paired by line.
+    """
+    new_headings = extract_headings(after)
+    return [
+        (old_slug, new_headings[index])
+        for index, old_slug in extract_headings(before).items()
+        if new_headings.get(index, old_slug) != old_slug
+    ]
+
+
+def collect_links(content):
+    """Return ``{(line_index, kind): [(target, fragment), ...]}`` for links with a fragment.
+
+    Kept for translated files, whose fragments the rules may have altered.
+    """
+    links = {}
+    for index, line in iter_prose_lines(content):
+        if "#" not in line:
+            continue
+        for kind, regex in enumerate(LINK_RES):
+            found = [match.group(2, 3) for match in regex.finditer(line)]
+            if found:
+                links[(index, kind)] = found
+    return links
+
+
+class AnchorIndex:
+    """Old -> new heading slugs of the whole corpus, keyed by ``(path, old_slug)``.
+
+    Paths are POSIX paths relative to the corpus root.
+    """
+
+    def __init__(self):
+        self._renames = {}
+
+    def __len__(self):
+        return len(self._renames)
+
+    def __iter__(self):
+        return iter(sorted(self._renames.items()))
+
+    def add(self, path, old_slug, new_slug):
+        self._renames[(path, old_slug)] = new_slug
+
+    def record(self, path, before, after):
+        """Record the headings of ``path`` renamed between ``before`` and ``after``.
+
+        Returns the number of renamed anchors.
+        """
+        renames = renamed_anchors(before, after)
+        for old_slug, new_slug in renames:
+            self.add(path, old_slug, new_slug)
+        return len(renames)
+
+    def lookup(self, path, slug):
+        return self._renames.get((path, slug))
+
+    def _resolve(self, path, target, fragment):
+        if SCHEME_RE.match(target):
+            return None
+        if target:
+            target_path = posixpath.normpath(posixpath.join(posixpath.dirname(path), unquote(target)))
+        else:
+            target_path = path
+        new_slug = self.lookup(target_path, unquote(fragment))
+        if new_slug is None:
+            return None
+        return quote(new_slug, safe="-_") if "%" in fragment else new_slug
+
+    def rewrite_links(self, path, content, original_links=None):
+        """Rewrite the links of ``path`` that point at renamed anchors.
+
+        When ``path`` was itself translated, pass ``collect_links(original)``: the
+        rules may have translated words inside link fragments too, so fragments
+        are then looked up as they were before translation (same line, same rank).
+        Returns the new content and the number of links rewritten.
+        """
+        if not self._renames and not original_links:
+            return content, 0
+        lines = content.split("\n")
+        rewritten = 0
+
+        def substitute(match, before):
+            nonlocal rewritten
+            target, fragment = before if before else match.group(2, 3)
+            new_fragment = self._resolve(path, target, fragment)
+            if new_fragment is None:
+                if fragment == match.group(3):
+                    return match.group(0)
+                # The rules translated an anchor that was not renamed: restore it.
+                new_fragment = fragment
+            rewritten += 1
+            return f"{match.group(1)}{match.group(2)}#{new_fragment}"
+
+        for index, line in iter_prose_lines(content):
+            if "#" not in line:
+                continue
+            for kind, regex in enumerate(LINK_RES):
+                before = (original_links or {}).get((index, kind))
+                if before and len(before) != len(regex.findall(line)):
+                    before = None
+                ranks = iter(before) if before else None
+                line = regex.sub(lambda m: substitute(m, next(ranks) if ranks else None), line)
+            lines[index] = line
+        return "\n".join(lines), rewritten
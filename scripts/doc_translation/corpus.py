@@ -0,0 +1,150 @@
+"""Translate a whole documentation corpus and repair the links it breaks."""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .anchors import AnchorIndex, collect_links, renamed_anchors
+from .domains import as_glossary
+from .engine import translate
+from .regex_safety import BudgetExceeded
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Documents the translation is applied to.
+DEFAULT_PATTERNS = (
+    ".github/copilot-instructions.md",
+    ".github/instructions/*.md",
+    "docs/**/*.md",
+)
+
+# Documents whose links are repaired (any of them may point into the corpus).
+LINK_PATTERNS = ("**/*.md",)
+
+EXCLUDED_DIRS = {".git", "node_modules", "bin", "obj", "dist", "test-results"}
+
+
+def iter_files(root, patterns):
+    """Yield the files of ``root`` matching ``patterns``, sorted and without duplicates."""
+    root = Path(root)
+    found = set()
+    for pattern in patterns:
+        for path in root.glob(pattern):
+            if path.is_file() and not EXCLUDED_DIRS.intersection(path.relative_to(root).parts):
+                found.add(path)
+    return sorted(found)
+
+
+def relative(root, path):
+    return Path(path).relative_to(root).as_posix()
+
+
+def read_text(path):
+    # Same decoding as the legacy scripts: BOM stripped, line endings untouched.
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        return f.read()
+
+
+def write_text(path, content):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(content)
+
+
+@dataclass
+class DocumentResult:
+    """Outcome of translating one document; picklable so workers can return it."""
+
+    path: str
+    content: str
+    fired: list
+    renames: list
+    links: dict
+
+
+def translate_document(path, content, rules, budget=None):
+    """Translate one document; return ``None`` when no rule fired.
+
+    Raises ``BudgetExceeded`` when ``budget`` (a ``TimeBudget``) is exceeded.
+    """
+    translated, fired = translate(content, rules, budget, path)
+    if not fired:
+        return None
+    return DocumentResult(
+        path=path,
+        content=translated,
+        fired=[rule.source for rule in fired],
+        renames=renamed_anchors(content, translated),
+        links=collect_links(content),
+    )
+
+
+@dataclass
+class CorpusReport:
+    translated: dict = field(default_factory=dict)
+    links: dict = field(default_factory=dict)
+    anchors: AnchorIndex = field(default_factory=AnchorIndex)
+    original_links: dict = field(default_factory=dict)
+    budget_errors: list = field(default_factory=list)
+
+    @property
+    def rules_applied(self):
+        return sum(len(fired) for fired in self.translated.values())
+
+    @property
+    def links_rewritten(self):
+        return sum(self.links.values())
+
+    def add(self, result):
+        """Record a translated document (the content itself is not kept)."""
+        self.translated[result.path] = result.fired
+        for old_slug, new_slug in result.renames:
+            self.anchors.add(result.path, old_slug, new_slug)
+        self.original_links[result.path] = result.links
+
+
+def rewrite_corpus_links(root, report, pending=None, dry_run=False, patterns=LINK_PATTERNS):
+    """Second pass: repair every link of the repository against the anchor index.
+
+    ``pending`` maps relative paths to translated contents not written to disk
+    (dry runs), used instead of the file on disk.
+    """
+    pending = pending or {}
+    paths = set(iter_files(root, patterns)).union(Path(root) / name for name in report.translated)
+    for path in sorted(paths):
+        name = relative(root, path)
+        content = pending[name] if name in pending else read_text(path)
+        rewritten, count = report.anchors.rewrite_links(name, content, report.original_links.get(name))
+        if count:
+            report.links[name] = count
+            if not dry_run:
+                write_text(path, rewritten)
+
+
+def translate_corpus(root, glossary, patterns=DEFAULT_PATTERNS, dry_run=False, budget=None):
+    """Translate every document of the corpus, then rewrite the broken links.
+
+    ``glossary`` is a rule list or an object selecting rules by path
+    (see ``domains.DomainGlossary``). The first pass records the renamed heading
+    anchors of each file while the translations are applied; the second pass
+    rewrites links through that index. Files going over ``budget`` are left
+    untouched and reported in ``report.budget_errors``.
+    """
+    root = Path(root)
+    glossary = as_glossary(glossary)
+    report = CorpusReport()
+    pending = {}
+    for path in iter_files(root, patterns):
+        name = relative(root, path)
+        try:
+            result = translate_document(name, read_text(path), glossary.rules_for(name), budget)
+        except BudgetExceeded as error:
+            report.budget_errors.append(error)
+            continue
+        if result is None:
+            continue
+        report.add(result)
+        if dry_run:
+            pending[result.path] = result.content
+        else:
+            write_text(path, result.content)
+    rewrite_corpus_links(root, report, pending, dry_run)
+    return report
@@ -0,0 +1,101 @@
+"""
+Domain-scoped glossaries selected by path globs.
+
+A document only pays for the rules of the domains its path matches (plus
+``common``). Glossary modules are imported and compiled the first time a
+matching document is seen, so a single-file run loads just what it needs.
+Rules go through ``regex_safety.check_rules`` when a glossary is built.
+"""
+
+import functools
+import importlib
+import re
+from dataclasses import dataclass
+
+from .regex_safety import check_rules
+
+
+@dataclass(frozen=True)
+class Domain:
+    name: str
+    patterns: tuple
+
+
+# Applied in this order; ``common`` always comes last.
+DOMAINS = (
+    Domain("csharp", (".github/instructions/csharp.*",)),
+    Domain("vue3", (".github/instructions/vue3.*",)),
+    Domain("ansible", (".github/instructions/ansible.*",)),
+    Domain("adr", ("docs/adr/**", ".github/instructions/adr.*")),
+)
+COMMON = "common"
+
+
+def glob_to_regex(pattern):
+    """Translate a path glob (``*``, ``?``, ``**``) into an anchored regex."""
+    parts = []
+    index = 0
+    while index < len(pattern):
+        if pattern.startswith("**/", index):
+            parts.append("(?:.*/)?")
+            index += 3
+        elif pattern.startswith("**", index):
+            parts.append(".*")
+            index += 2
+        elif pattern[index] == "*":
+            parts.append("[^/]*")
+            index += 1
+        elif pattern[index] == "?":
+            parts.append("[^/]")
+            index += 1
+        else:
+            parts.append(re.escape(pattern[index]))
+            index += 1
+    return re.compile("".join(parts) + r"\Z")
+
+
+@functools.lru_cache(maxsize=None)
+def load_domain(name):
+    """Import and load the rules of one glossary module (once per process)."""
+    module = importlib.import_module(f"{__package__}.glossaries.{name}")
+    return tuple(module.load())
+
+
+class DomainGlossary:
+    """Select, load and cache the rules of each document by its relative path."""
+
+    def __init__(self, domains=DOMAINS, common=COMMON):
+        self._domains = [(domain.name, [glob_to_regex(p) for p in domain.patterns]) for domain in domains]
+        self._common = common
+        self._combined = {}
+
+    def domains_for(self, path):
+        names = tuple(
+            name for name, regexes in self._domains
+            if any(regex.match(path) for regex in regexes)
+        )
+        return names + ((self._common,) if self._common else ())
+
+    def rules_for(self, path):
+        names = self.domains_for(path)
+        rules = self._combined.get(names)
+        if rules is None:
+            rules, _ = check_rules(rule for name in names for rule in load_domain(name))
+            self._combined[names] = rules
+        return rules
+
+
+class FlatGlossary:
+    """The same rules for every document (legacy behaviour, compiled artifacts)."""
+
+    def __init__(self, rules):
+        self.rules, _ = check_rules(rules)
+
+    def rules_for(self, path):
+        return self.rules
+
+
+def as_glossary(rules_or_glossary):
+    if hasattr(rules_or_glossary, "rules_for"):
+        return rules_or_glossary
+    return FlatGlossary(rules_or_glossary)
@@ -0,0 +1,68 @@
+"""Apply ordered rules to a document with the same semantics as the legacy scripts."""
+
+import re
+import time
+
+from .regex_safety import BudgetExceeded, apply_by_line, needs_line_checks
+from .trie import open_trie
+
+
+def apply_rule(content, rule):
+    """Apply one rule; return the new content (identical object when nothing fired)."""
+    if rule.kind == "trie":
+        return open_trie(rule.pattern).replace_all(content)
+    if rule.kind == "literal" and rule.ignore_case:
+        pattern = re.compile(re.escape(rule.pattern), re.IGNORECASE)
+        return pattern.sub(lambda _: rule.replacement, content)
+    if rule.kind == "literal":
+        if rule.pattern in content:
+            return content.replace(rule.pattern, rule.replacement)
+        return content
+    if re.search(rule.pattern, content):
+        return re.sub(rule.pattern, rule.replacement, content)
+    return content
+
+
+def _span(content, rule):
+    """Line number and text of the input span ``rule`` was working on.
+
+    Only literals are located (their first occurrence; a ``find`` is cheap).
+    Running a regex again to locate its span would repeat the cost the budget
+    is there to stop, so it is reported as unknown: ``(None, "")``. Regex rules
+    applied line by line (``regex_safety.apply_by_line``) report their own line.
+    """
+    start = content.find(rule.pattern) if rule.kind == "literal" else -1
+    if start < 0:
+        return None, ""
+    line_start = content.rfind("\n", 0, start) + 1
+    line_end = content.find("\n", start)
+    return content.count("\n", 0, start) + 1, content[line_start:line_end if line_end >= 0 else None]
+
+
+def translate(content, rules, budget=None, path=None):
+    """Apply ``rules`` one after another.
+
+    Returns the translated content and the list of rules that changed it. With a
+    ``TimeBudget``, a rule or the whole file going over its limit raises
+    ``BudgetExceeded`` naming the rule and the input span it was working on.
+    """
+    fired = []
+    file_started = time.perf_counter()
+    for rule in rules:
+        started = time.perf_counter()
+        if budget is not None and budget.per_rule is not None and needs_line_checks(rule):
+            updated = apply_by_line(content, rule, budget, path, started)
+        else:
+            updated = apply_rule(content, rule)
+        if budget is not None:
+            now = time.perf_counter()
+            if budget.per_rule is not None and now - started > budget.per_rule:
+                line, excerpt = _span(content, rule)
+                raise BudgetExceeded("rule", rule.source, path, now - started, budget.per_rule, line, excerpt)
+            if budget.per_file is not None and now - file_started > budget.per_file:
+                line, excerpt = _span(content, rule)
+                raise BudgetExceeded("file", rule.source, path, now - file_started, budget.per_file, line, excerpt)
+        if updated != content:
+            fired.append(rule)
+            content = updated
+    return content, fired
@@ -0,0 +1,243 @@
+"""
+Differential equivalence runner: legacy scripts versus the new engine.
+
+Every corpus file is copied twice. On the first copy the legacy scripts of
+``LEGACY_SEQUENCE`` run one after another, their logic unchanged (only the
+hard-coded ``file_path`` is redirected to the copy). On the second copy the
+engine applies the selected glossary. Outputs are compared byte for byte and a
+divergence is narrowed down to the responsible rule: first the legacy script
+after which both sides differ, then, by bisection over the entries of that
+script's table (read from its AST), the first entry whose truncated legacy run
+differs from the engine. Entries missing from the engine's rules (pruned
+artifacts, other rule sets) are blamed like any other.
+"""
+
+import ast
+import contextlib
+import io
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from .corpus import DEFAULT_PATTERNS, iter_files, read_text, relative, write_text
+from .domains import as_glossary
+from .engine import translate
+from .rules import LEGACY_SEQUENCE, SCRIPTS_DIR
+
+
+@dataclass
+class FileComparison:
+    path: str
+    identical: bool
+    legacy_seconds: float
+    engine_seconds: float
+    stage: Optional[str] = None
+    rule: Optional[str] = None
+    first_difference: Optional[dict] = None
+
+    @property
+    def speedup(self):
+        return self.legacy_seconds / self.engine_seconds if self.engine_seconds else float("inf")
+
+
+@dataclass
+class EquivalenceReport:
+    files: list = field(default_factory=list)
+
+    @property
+    def divergent(self):
+        return [comparison for comparison in self.files if not comparison.identical]
+
+    @property
+    def speedup(self):
+        engine = sum(comparison.engine_seconds for comparison in self.files)
+        legacy = sum(comparison.legacy_seconds for comparison in self.files)
+        return legacy / engine if engine else float("inf")
+
+
+class LegacyScriptRunner:
+    """Compile a legacy script once, with ``file_path`` and optionally its table patched.
+
+    ``max_line`` keeps only the table entries whose key first appears on or before
+    that line. A repeated dict key keeps all its entries, so, as for the loaded
+    rules, the key sits at its first position with its last value.
+    """
+
+    def __init__(self, script, scripts_dir=SCRIPTS_DIR, max_line=None):
+        self.script = script
+        path = Path(scripts_dir) / script.filename
+        self._tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        self._filename = str(path)
+        if max_line is not None:
+            self._truncate_table(max_line)
+
+    def _assignment(self, name):
+        for node in self._tree.body:
+            if isinstance(node, ast.Assign) and any(
+                isinstance(target, ast.Name) and target.id == name for target in node.targets
+            ):
+                return node
+        raise LookupError(f"{self.script.filename}: no '{name}' assignment")
+
+    def _key_line(self, table):
+        """Map each entry of ``table`` to the line where its key first appears."""
+        if not isinstance(table, ast.Dict):
+            return [item.elts[0].lineno for item in table.elts]
+        first = {}
+        for key in table.keys:
+            first.setdefault(ast.dump(key), key.lineno)
+        return [first[ast.dump(key)] for key in table.keys]
+
+    def key_lines(self):
+        """Sorted first lines of the table keys, as in the ``source`` of the loaded rules."""
+        return sorted(set(self._key_line(self._assignment(self.script.table).value)))
+
+    def _truncate_table(self, max_line):
+        table = self._assignment(self.script.table).value
+        kept = [line <= max_line for line in self._key_line(table)]
+        if isinstance(table, ast.Dict):
+            table.keys = [k for k, keep in zip(table.keys, kept) if keep]
+            table.values = [v for v, keep in zip(table.values, kept) if keep]
+        else:
+            table.elts = [item for item, keep in zip(table.elts, kept) if keep]
+
+    def run(self, target):
+        """Run the script on ``target``; return the elapsed seconds."""
+        self._assignment("file_path").value = ast.copy_location(ast.Constant(str(target)), self._tree)
+        code = compile(ast.fix_missing_locations(self._tree), self._filename, "exec")
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            exec(code, {"__name__": "__main__", "__file__": self._filename})
+        return time.perf_counter() - started
+
+
+def _first_difference(legacy, engine):
+    legacy_lines, engine_lines = legacy.split("\n"), engine.split("\n")
+    for index, (left, right) in enumerate(zip(legacy_lines, engine_lines)):
+        if left != right:
+            return {"line": index + 1, "legacy": left, "engine": right}
+    index = min(len(legacy_lines), len(engine_lines))
+    return {"line": index + 1, "legacy": "\n".join(legacy_lines[index:]), "engine": "\n".join(engine_lines[index:])}
+
+
+def _stage_rules(rules, script):
+    return [rule for rule in rules if rule.source.split(":")[0] == script.filename]
+
+
+def _source_line(rule):
+    return int(rule.source.rsplit(":", 1)[1])
+
+
+class EquivalenceRunner:
+    """Compare the legacy sequence and the engine on copies of the corpus."""
+
+    def __init__(self, glossary, sequence=LEGACY_SEQUENCE, scripts_dir=SCRIPTS_DIR):
+        self.glossary = as_glossary(glossary)
+        self.sequence = sequence
+        self.scripts_dir = scripts_dir
+        self._runners = [LegacyScriptRunner(script, scripts_dir) for script in sequence]
+
+    def run(self, root, patterns=DEFAULT_PATTERNS):
+        root = Path(root)
+        report = EquivalenceReport()
+        with tempfile.TemporaryDirectory(prefix="doc-equivalence-") as directory:
+            workdir = Path(directory)
+            for path in iter_files(root, patterns):
+                report.files.append(self.compare(relative(root, path), path, workdir))
+        return report
+
+    def compare(self, name, source, workdir):
+        legacy_copy = workdir / "legacy" / name
+        engine_copy = workdir / "engine" / name
+        for copy in (legacy_copy, engine_copy):
+            copy.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(source, copy)
+
+        stages = [read_text(legacy_copy)]
+        legacy_seconds = 0.0
+        for runner in self._runners:
+            legacy_seconds += runner.run(legacy_copy)
+            stages.append(read_text(legacy_copy))
+
+        rules = self.glossary.rules_for(name)
+        started = time.perf_counter()
+        translated, _ = translate(read_text(engine_copy), rules)
+        write_text(engine_copy, translated)
+        engine_seconds = time.perf_counter() - started
+
+        comparison = FileComparison(
+            path=name,
+            identical=legacy_copy.read_bytes() == engine_copy.read_bytes(),
+            legacy_seconds=legacy_seconds,
+            engine_seconds=engine_seconds,
+        )
+        if not comparison.identical:
+            comparison.first_difference = _first_difference(stages[-1], translated)
+            self._minimize(comparison, stages, rules, workdir)
+        return comparison
+
+    def _diverges(self, script, before, stage_rules, max_line, scratch):
+        """Whether the legacy table and the engine rules cut at ``max_line`` disagree on ``before``."""
+        write_text(scratch, before)
+        LegacyScriptRunner(script, self.scripts_dir, max_line).run(scratch)
+        subset = [rule for rule in stage_rules if _source_line(rule) <= max_line]
+        return translate(before, subset)[0] != read_text(scratch)
+
+    def check_cut_points(self, root, patterns=DEFAULT_PATTERNS):
+        """Bisection self-check: return the ``(path, script, line)`` cut points that diverge.
+
+        Meant to run with the unchanged legacy rules, for which no cut point of any
+        stage may diverge; otherwise the bisection would blame the wrong entry.
+        """
+        root = Path(root)
+        failures = []
+        with tempfile.TemporaryDirectory(prefix="doc-cut-points-") as directory:
+            scratch = Path(directory) / "document"
+            for path in iter_files(root, patterns):
+                name = relative(root, path)
+                rules = self.glossary.rules_for(name)
+                before = read_text(path)
+                for position, script in enumerate(self.sequence):
+                    stage_rules = _stage_rules(rules, script)
+                    for line in self._runners[position].key_lines():
+                        if self._diverges(script, before, stage_rules, line, scratch):
+                            failures.append((name, script.filename, line))
+                    before = translate(before, stage_rules)[0]
+        return failures
+
+    def _minimize(self, comparison, stages, rules, workdir):
+        """Find the legacy script, then the table entry, where both sides part."""
+        for position, script in enumerate(self.sequence):
+            before = stages[position]
+            stage_rules = _stage_rules(rules, script)
+            engine_after, _ = translate(before, stage_rules)
+            if engine_after == stages[position + 1]:
+                continue
+            comparison.stage = script.filename
+            lines = self._runners[position].key_lines()
+            scratch = workdir / "bisect" / comparison.path
+            scratch.parent.mkdir(parents=True, exist_ok=True)
+
+            def diverges(max_line):
+                return self._diverges(script, before, stage_rules, max_line, scratch)
+
+            low, high = 0, len(lines) - 1
+            if not lines or not diverges(lines[high]):
+                comparison.rule = f"{script.filename} (engine rules outside the legacy table)"
+                return
+            while low < high:
+                middle = (low + high) // 2
+                if diverges(lines[middle]):
+                    high = middle
+                else:
+                    low = middle + 1
+            comparison.rule = f"{script.filename}:{lines[low]}"
+            return
+        if translate(stages[0], rules)[0] == stages[-1]:
+            comparison.stage = "encoding"
+        else:
+            comparison.stage = "engine"
+            comparison.rule = "rules outside the legacy sequence"
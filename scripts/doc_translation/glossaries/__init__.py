@@ -0,0 +1,29 @@
+"""
+Domain glossaries, one module per documentation domain.
+
+Each module exposes ``load()`` returning its ordered rules. Modules declaring a
+``HEADINGS`` table translate whole heading lines only, so the short French words
+they contain never rewrite running text.
+"""
+
+import re
+from pathlib import Path
+
+from ..rules import Rule
+
+
+def heading_rules(module_file, headings):
+    """Rules for a ``{french heading line: english heading line}`` table of a module.
+
+    The source of each rule is ``glossaries/<module>.py:<french heading>``.
+    """
+    filename = Path(module_file).name
+    return [
+        Rule(
+            pattern=rf"(?m)^{re.escape(heading)}(?=\r?$)",
+            replacement=translation,
+            kind="regex",
+            source=f"glossaries/{filename}:{heading}",
+        )
+        for heading, translation in headings.items()
+    ]
@@ -0,0 +1,21 @@
+"""Architecture Decision Record glossary (sections of docs/adr/*.adr.md)."""
+
+from . import heading_rules
+
+HEADINGS = {
+    "## Statut": "## Status",
+    "## Contexte": "## Context",
+    "## Décision": "## Decision",
+    "## Conséquences": "## Consequences",
+    "### Positives": "### Positive",
+    "### Négatives": "### Negative",
+    "### Neutres": "### Neutral",
+    "## Alternatives considérées": "## Alternatives Considered",
+    "## Alternatives Considérées": "## Alternatives Considered",
+    "### Principe fondamental": "### Core Principle",
+    "## Références": "## References",
+}
+
+
+def load():
+    return heading_rules(__file__, HEADINGS)
@@ -0,0 +1,15 @@
+"""Ansible instruction files glossary."""
+
+from . import heading_rules
+
+HEADINGS = {
+    "### Validation et Tests": "### Validation and Tests",
+    "### Workflow de Test STRICT - OBLIGATOIRE": "### STRICT Test Workflow - MANDATORY",
+    "### Vérification de Base": "### Basic Verification",
+    "### Vault Password File Sécurisé": "### Secured Vault Password File",
+    "### group_vars/dbservers/vault.yml (CHIFFRÉ)": "### group_vars/dbservers/vault.yml (ENCRYPTED)",
+}
+
+
+def load():
+    return heading_rules(__file__, HEADINGS)
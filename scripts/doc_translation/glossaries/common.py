@@ -0,0 +1,19 @@
+"""Section headings shared by every instruction file."""
+
+from . import heading_rules
+
+HEADINGS = {
+    "## ✅ À FAIRE": "## ✅ DO",
+    "## ⛔ À NE PAS FAIRE": "## ⛔ DO NOT",
+    "## 🎯 Actions Obligatoires (Mandatory)": "## 🎯 Mandatory Actions",
+    "### ⚠️ LECTURE ADR OBLIGATOIRE": "### ⚠️ MANDATORY ADR READING",
+    "## Anti-Patterns à Éviter": "## Anti-Patterns to Avoid",
+    "## ⚠️ Bonnes Pratiques": "## ⚠️ Best Practices",
+    "### ✅ Bonnes Pratiques": "### ✅ Best Practices",
+    "### ❌ Mauvaises Pratiques": "### ❌ Bad Practices",
+    "## Ressources et Références": "## Resources and References",
+}
+
+
+def load():
+    return heading_rules(__file__, HEADINGS)
@@ -0,0 +1,7 @@
+"""C# documentation glossary: the tables of the legacy translation scripts."""
+
+from ..rules import load_legacy_rules
+
+
+def load():
+    return load_legacy_rules()
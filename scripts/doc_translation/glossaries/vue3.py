@@ -0,0 +1,23 @@
+"""Vue 3 instruction files glossary."""
+
+from . import heading_rules
+
+HEADINGS = {
+    "### ❌ Réactivité Perdue": "### ❌ Lost Reactivity",
+    "### ❌ Props Mutées Directement": "### ❌ Directly Mutated Props",
+    "### ❌ Oublier le Cleanup": "### ❌ Forgetting Cleanup",
+    "### ❌ Logique Métier dans le Template": "### ❌ Business Logic in the Template",
+    "### ❌ Erreurs Courantes": "### ❌ Common Mistakes",
+    "### ❌ Effets de Bord dans Computed": "### ❌ Side Effects in Computed",
+    "### ❌ Composants Trop Gros": "### ❌ Oversized Components",
+    "### ❌ Anti-Pattern : Destructuration Sans storeToRefs": "### ❌ Anti-Pattern: Destructuring Without storeToRefs",
+    "### Éviter v-if avec v-for": "### Avoid v-if with v-for",
+    "### Éviter les Fonctions Inline": "### Avoid Inline Functions",
+    "### v-once pour Contenu Statique": "### v-once for Static Content",
+    "### v-memo pour Memoization": "### v-memo for Memoization",
+    "### v-html et v-text": "### v-html and v-text",
+}
+
+
+def load():
+    return heading_rules(__file__, HEADINGS)
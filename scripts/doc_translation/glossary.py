@@ -0,0 +1,134 @@
+"""
+Glossary automaton and compiled glossary artifact.
+
+``Automaton`` is an Aho-Corasick matcher over the literal rule keys: one pass over
+a text finds every occurrence of every key. The compiled artifact is a JSON file
+holding the ordered rules, so a glossary can be pruned once and loaded without
+parsing the legacy scripts.
+"""
+
+import json
+from collections import deque
+
+from .rules import Rule, compile_replacement
+
+ARTIFACT_VERSION = 1
+
+
+class Automaton:
+    """Aho-Corasick automaton over ``keys``.
+
+    Keys flagged in ``ignore_case`` are matched case-insensitively, the others
+    exactly. Matching casefolds with ``str.lower``, which keeps the length of
+    French text unchanged.
+    """
+
+    def __init__(self, keys, ignore_case=()):
+        self.keys = list(keys)
+        self._ignore_case = set(ignore_case)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for index, key in enumerate(self.keys):
+            if key:
+                self._insert(key.lower(), index)
+        self._link()
+
+    def _insert(self, key, index):
+        node = 0
+        for char in key:
+            child = self._goto[node].get(char)
+            if child is None:
+                child = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[node][char] = child
+            node = child
+        self._out[node].append(index)
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def __len__(self):
+        return len(self._goto)
+
+    def iter_matches(self, text):
+        """Yield ``(start, end, key_index)`` for every occurrence, overlaps included."""
+        goto, fail, out, keys = self._goto, self._fail, self._out, self.keys
+        node = 0
+        for end, char in enumerate(text.lower(), 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in out[node]:
+                start = end - len(keys[index])
+                if index in self._ignore_case or text[start:end] == keys[index]:
+                    yield start, end, index
+
+    def present(self, text):
+        """Return the indices of the keys occurring in ``text``."""
+        return {index for _, _, index in self.iter_matches(text)}
+
+
+def literal_automaton(rules):
+    """Automaton over the literal rules of ``rules``; key indices are rule indices.
+
+    Regex rules get an empty key and therefore never match.
+    """
+    keys = [rule.pattern if rule.kind == "literal" else "" for rule in rules]
+    ignore_case = [index for index, rule in enumerate(rules) if rule.ignore_case]
+    return Automaton(keys, ignore_case)
+
+
+def _rule_to_json(rule):
+    entry = {"pattern": rule.pattern, "kind": rule.kind, "source": rule.source}
+    if rule.expression:
+        entry["expression"] = rule.expression
+    else:
+        entry["replacement"] = rule.replacement
+    if rule.ignore_case:
+        entry["ignore_case"] = True
+    return entry
+
+
+def _rule_from_json(entry, filename):
+    expression = entry.get("expression", "")
+    return Rule(
+        pattern=entry["pattern"],
+        replacement=compile_replacement(expression, filename) if expression else entry["replacement"],
+        kind=entry["kind"],
+        source=entry["source"],
+        ignore_case=entry.get("ignore_case", False),
+        expression=expression,
+    )
+
+
+def save_glossary(path, rules, pruned=()):
+    """Write the compiled glossary artifact; ``pruned`` lists the sources left out."""
+    artifact = {
+        "version": ARTIFACT_VERSION,
+        "rules": [_rule_to_json(rule) for rule in rules],
+        "pruned": sorted(pruned),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(artifact, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def load_glossary(path):
+    """Load the ordered rules of a compiled glossary artifact."""
+    with open(path, "r", encoding="utf-8") as f:
+        artifact = json.load(f)
+    if artifact.get("version") != ARTIFACT_VERSION:
+        raise ValueError(f"{path}: unsupported glossary version {artifact.get('version')!r}")
+    return [_rule_from_json(entry, str(path)) for entry in artifact["rules"]]
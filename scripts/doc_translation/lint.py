@@ -0,0 +1,186 @@
+"""
+Glossary linter: find the rules that force extra cleanup passes.
+
+- shadowed: an earlier rule rewrites part of the key, so the rule can no longer match
+  (``"Calcule le prix."`` after ``\\bCalcule\\b``);
+- dead: the rule never changes any document of the corpus;
+- hazard: a literal key also matches inside longer words (``"est"`` in ``"test"``);
+  for a trie glossary, the entries whose keys occur inside words (the trie skips
+  them, see ``trie``; a large count usually means short entries to review);
+- chain: the output of a rule contains the input of a later rule, which rewrites it again;
+- unsafe: a regex rule can backtrack catastrophically and is rewritten with bounded
+  repeats or rejected (see ``regex_safety``); the other checks see the rewritten rule.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+from .engine import apply_rule, translate
+from .glossary import literal_automaton
+from .regex_safety import check_rule
+from .trie import in_word, open_trie
+from .rules import Rule
+
+KINDS = ("unsafe", "shadowed", "dead", "hazard", "chain")
+
+_WORD_RE = re.compile(r"\w")
+
+
+@dataclass(frozen=True)
+class Finding:
+    kind: str
+    rule: Rule
+    other: Optional[Rule] = None
+    detail: str = ""
+
+
+def _is_word_char(char):
+    return bool(char) and bool(_WORD_RE.match(char))
+
+
+def _rewrites(rule, text):
+    """Whether ``rule`` changes ``text`` (identity rules such as ``"Format"`` never do)."""
+    if rule.kind == "literal":
+        return rule.replacement != rule.pattern
+    return apply_rule(text, rule) != text
+
+
+def find_shadowed(rules, automaton):
+    findings = []
+    for j, rule in enumerate(rules):
+        if rule.kind != "literal":
+            continue
+        earlier = {i for _, _, i in automaton.iter_matches(rule.pattern) if i < j}
+        earlier.update(
+            i for i, other in enumerate(rules[:j])
+            if other.kind == "regex" and re.search(other.pattern, rule.pattern)
+        )
+        for i in sorted(earlier):
+            if _rewrites(rules[i], rule.pattern):
+                how = "contains" if rules[i].kind == "literal" else "is matched by"
+                findings.append(Finding("shadowed", rule, rules[i], f"key {how} {rules[i].pattern!r}"))
+                break
+    return findings
+
+
+def find_chains(rules, automaton):
+    findings = []
+    for i, rule in enumerate(rules):
+        if rule.kind == "trie" or not isinstance(rule.replacement, str):
+            continue
+        # A regex cannot be tested against its own source (``\bRetourne\b`` does
+        # not match its pattern text); only literal identity rules are skipped.
+        if rule.kind == "literal" and not _rewrites(rule, rule.pattern):
+            continue
+        later = {j for _, _, j in automaton.iter_matches(rule.replacement) if j > i}
+        later.update(
+            j for j in range(i + 1, len(rules))
+            if rules[j].kind == "regex" and re.search(rules[j].pattern, rule.replacement)
+        )
+        for j in sorted(later):
+            if _rewrites(rules[j], rule.replacement):
+                findings.append(Finding("chain", rule, rules[j], f"output {rule.replacement!r} is rewritten again"))
+    return findings
+
+
+def scan_corpus(rules, automaton, documents):
+    """One automaton pass per document: key occurrences and in-word matches."""
+    occurrences = Counter()
+    hazards = {}
+    for path, content in documents:
+        for start, end, index in automaton.iter_matches(content):
+            occurrences[index] += 1
+            key = rules[index].pattern
+            if not _rewrites(rules[index], key):
+                continue
+            inside = (_is_word_char(key[0]) and _is_word_char(content[start - 1:start])) or \
+                     (_is_word_char(key[-1]) and _is_word_char(content[end:end + 1]))
+            if not inside:
+                continue
+            if index not in hazards:
+                left = re.search(r"\w*$", content[max(0, start - 40):start]).group(0)
+                right = re.match(r"\w*", content[end:end + 40]).group(0)
+                hazards[index] = (0, f"{path}: {left}{content[start:end]}{right}")
+            count, example = hazards[index]
+            hazards[index] = (count + 1, example)
+    return occurrences, hazards
+
+
+def find_trie_hazards(rules, documents, examples=3):
+    """Trie entries whose keys occur inside longer words of the corpus."""
+    findings = []
+    for rule in rules:
+        if rule.kind != "trie":
+            continue
+        trie = open_trie(rule.pattern)
+        keys = Counter()
+        samples = {}
+        for path, content in documents:
+            data = content.encode("utf-8")
+            for start, end, _ in trie.iter_matches(content, whole_words=False):
+                if not in_word(data, start, end):
+                    continue
+                key = data[start:end].decode("utf-8")
+                keys[key] += 1
+                if key not in samples:
+                    left = re.search(rb"\w*$", data[max(0, start - 40):start]).group(0)
+                    right = re.match(rb"\w*", data[end:end + 40]).group(0)
+                    samples[key] = f"{path}: {(left + data[start:end] + right).decode('utf-8', 'replace')}"
+        if keys:
+            top = ", ".join(f"{key!r} ({count}, e.g. {samples[key]})" for key, count in keys.most_common(examples))
+            findings.append(Finding(
+                "hazard", rule,
+                detail=f"{len(keys)} entries occur inside words ({sum(keys.values())} times, skipped): {top}",
+            ))
+    return findings
+
+
+def find_dead(rules, documents, occurrences):
+    """Rules that never changed any document when the rule set is applied in order."""
+    fired = set()
+    for _, content in documents:
+        _, applied = translate(content, rules)
+        fired.update(rule.source for rule in applied)
+    findings = []
+    for index, rule in enumerate(rules):
+        if rule.source in fired:
+            continue
+        if rule.kind == "literal" and not occurrences[index]:
+            detail = "no occurrence in the corpus"
+        elif rule.kind == "literal":
+            detail = f"{occurrences[index]} occurrences consumed by earlier rules or no-op"
+        else:
+            detail = "never rewrites the corpus"
+        findings.append(Finding("dead", rule, detail=detail))
+    return findings
+
+
+def lint(rules, documents):
+    """Analyse ``rules`` against ``documents`` (a list of ``(path, content)``)."""
+    checked, findings = [], []
+    for rule in rules:
+        safe, safety = check_rule(rule)
+        if safety is None or safety.status != "rejected":
+            checked.append(safe)
+        if safety:
+            findings.append(Finding("unsafe", rule, detail=f"{safety.status}: {safety.reason}"))
+    rules = checked
+    automaton = literal_automaton(rules)
+    occurrences, hazards = scan_corpus(rules, automaton, documents)
+    findings += find_shadowed(rules, automaton)
+    findings += find_dead(rules, documents, occurrences)
+    findings += [
+        Finding("hazard", rules[index], detail=f"{count} in-word matches, e.g. {example}")
+        for index, (count, example) in sorted(hazards.items())
+    ]
+    findings += find_trie_hazards(rules, documents)
+    findings += find_chains(rules, automaton)
+    return findings
+
+
+def prune(rules, findings):
+    """Drop the dead rules; return the kept rules and the sources of the pruned ones."""
+    dead = {finding.rule.source for finding in findings if finding.kind == "dead"}
+    return [rule for rule in rules if rule.source not in dead], dead
@@ -0,0 +1,144 @@
+"""
+Asynchronous corpus runner for high-latency filesystems (devcontainer bind mounts).
+
+Three stages connected by bounded queues:
+
+    paths -> [readers: thread pool] -> [translators: process pool] -> [writers: thread pool]
+
+Reads and writes overlap with the translation work, and the bounded queues cap
+how many documents are held in memory at once. The link pass runs afterwards,
+exactly as in ``corpus.translate_corpus``.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from .corpus import (
+    DEFAULT_PATTERNS,
+    CorpusReport,
+    iter_files,
+    read_text,
+    relative,
+    rewrite_corpus_links,
+    translate_document,
+    write_text,
+)
+from .domains import DomainGlossary, as_glossary
+from .regex_safety import BudgetExceeded
+
+_DONE = object()
+
+# Glossary of the current worker process, created once by the pool initializer
+# (callable replacements cannot be pickled, so rules are never sent to workers).
+# Domain glossaries are then loaded lazily, per worker, as documents arrive.
+_worker_glossary = None
+
+# The reader threads are already running when the pool starts its workers, and
+# forking a multi-threaded process can deadlock: use forkserver (spawn on Windows).
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def _init_worker(rule_loader):
+    global _worker_glossary
+    _worker_glossary = as_glossary(rule_loader())
+
+
+def _translate_in_worker(path, content, budget):
+    return translate_document(path, content, _worker_glossary.rules_for(path), budget)
+
+
+@dataclass(frozen=True)
+class PipelineOptions:
+    """Concurrency of each stage and capacity of the queues between them."""
+
+    readers: int = 8
+    workers: int = os.cpu_count() or 1
+    writers: int = 4
+    queue_size: int = 16
+
+
+async def _stage(count, inbox, outbox, handle):
+    """Run ``count`` consumers of ``inbox``; forward ``_DONE`` once all of them finished."""
+
+    async def consume():
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                await inbox.put(_DONE)
+                return
+            result = await handle(item)
+            if result is not None and outbox is not None:
+                await outbox.put(result)
+
+    await asyncio.gather(*(consume() for _ in range(count)))
+    if outbox is not None:
+        await outbox.put(_DONE)
+
+
+async def run_pipeline(root, patterns=DEFAULT_PATTERNS, dry_run=False,
+                       options=PipelineOptions(), rule_loader=DomainGlossary, budget=None):
+    """Translate the corpus under ``root`` and repair its links; return a ``CorpusReport``.
+
+    ``rule_loader`` is a picklable callable run once in each worker process; it
+    returns a rule list or a glossary selecting rules by path. Files going over
+    ``budget`` are skipped and reported in ``report.budget_errors``.
+    """
+    root = Path(root)
+    loop = asyncio.get_running_loop()
+    report = CorpusReport()
+    pending = {}
+    paths = asyncio.Queue(options.queue_size)
+    documents = asyncio.Queue(options.queue_size)
+    results = asyncio.Queue(options.queue_size)
+
+    with ThreadPoolExecutor(options.readers + options.writers) as io_pool, \
+            ProcessPoolExecutor(options.workers, mp_context=multiprocessing.get_context(_START_METHOD),
+                                initializer=_init_worker, initargs=(rule_loader,)) as cpu_pool:
+
+        async def feed():
+            for path in iter_files(root, patterns):
+                await paths.put(path)
+            await paths.put(_DONE)
+
+        async def read(path):
+            content = await loop.run_in_executor(io_pool, read_text, path)
+            return relative(root, path), content
+
+        async def translate(document):
+            try:
+                return await loop.run_in_executor(cpu_pool, _translate_in_worker, *document, budget)
+            except BudgetExceeded as error:
+                report.budget_errors.append(error)
+                return None
+
+        async def write(result):
+            report.add(result)
+            if dry_run:
+                pending[result.path] = result.content
+            else:
+                await loop.run_in_executor(io_pool, write_text, root / result.path, result.content)
+
+        stages = asyncio.gather(
+            feed(),
+            _stage(options.readers, paths, documents, read),
+            _stage(options.workers, documents, results, translate),
+            _stage(options.writers, results, None, write),
+        )
+        try:
+            await stages
+        except BaseException:
+            stages.cancel()
+            raise
+
+        await loop.run_in_executor(io_pool, rewrite_corpus_links, root, report, pending, dry_run)
+    return report
+
+
+def translate_corpus_async(root, patterns=DEFAULT_PATTERNS, dry_run=False,
+                           options=PipelineOptions(), rule_loader=DomainGlossary, budget=None):
+    """Synchronous wrapper around ``run_pipeline``."""
+    return asyncio.run(run_pipeline(root, patterns, dry_run, options, rule_loader, budget))
@@ -0,0 +1,300 @@
+"""
+Backtracking-safe regex rules and runtime time budgets.
+
+Compile time: every regex rule is parsed with the ``re`` parser.
+
+- nested unbounded repeats (``(a+)+``, ``(?:\\s*\\w+)*``) can backtrack
+  exponentially: the rule is rejected;
+- unbounded repeats of broad atoms (``.+``, ``[^x]*``, ``\\S+``) backtrack over the
+  whole line for every candidate start: the repeat is rewritten with an upper
+  bound (``.+`` -> ``.{1,500}``), which only changes matches longer than the bound.
+
+Run time: ``TimeBudget`` limits the time spent per rule and per file. Python
+cannot interrupt a running ``re`` call, so rules that may still backtrack are
+applied line by line (when they cannot match across lines) and the budget is
+checked between lines; ``BudgetExceeded`` then names the rule and the line.
+"""
+
+import functools
+import re
+import time
+from dataclasses import dataclass, replace
+from typing import Optional
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+DEFAULT_REPEAT_LIMIT = 500
+
+_NEWLINE = ord("\n")
+_LINE_SAFE_AT = (sre_constants.AT_BOUNDARY, sre_constants.AT_NON_BOUNDARY)
+_BROAD_CATEGORIES = (
+    sre_constants.CATEGORY_NOT_SPACE,
+    sre_constants.CATEGORY_NOT_WORD,
+    sre_constants.CATEGORY_NOT_DIGIT,
+    sre_constants.CATEGORY_SPACE,
+)
+_NEWLINE_CATEGORIES = (
+    sre_constants.CATEGORY_SPACE,
+    sre_constants.CATEGORY_NOT_WORD,
+    sre_constants.CATEGORY_NOT_DIGIT,
+)
+_REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) + (
+    (sre_constants.POSSESSIVE_REPEAT,) if hasattr(sre_constants, "POSSESSIVE_REPEAT") else ()
+)
+
+
+class UnsafePatternError(ValueError):
+    """Raised when rules contain patterns that can backtrack exponentially."""
+
+    def __init__(self, findings):
+        self.findings = findings
+        lines = [f"{finding.rule.source} {finding.rule.pattern!r}: {finding.reason}" for finding in findings]
+        super().__init__("unsafe regex rules:\n  " + "\n  ".join(lines))
+
+
+class BudgetExceeded(TimeoutError):
+    """A rule or a file went over its time budget."""
+
+    def __init__(self, scope, source, path, elapsed, limit, line=None, excerpt=""):
+        self.scope = scope
+        self.source = source
+        self.path = path
+        self.elapsed = elapsed
+        self.limit = limit
+        self.line = line
+        self.excerpt = excerpt
+        span = f"{path}:{line} {excerpt[:80]!r}" if line else f"{path} (span unknown)"
+        super().__init__(
+            f"{scope} budget exceeded ({elapsed * 1000:.1f} ms > {limit * 1000:.1f} ms) by {source} on {span}"
+        )
+
+    def __reduce__(self):
+        return type(self), (self.scope, self.source, self.path, self.elapsed, self.limit, self.line, self.excerpt)
+
+
+@dataclass(frozen=True)
+class TimeBudget:
+    """Seconds allowed per rule and per file (``None``: unlimited)."""
+
+    per_rule: Optional[float] = None
+    per_file: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class SafetyFinding:
+    rule: object
+    status: str
+    reason: str
+
+
+@dataclass(frozen=True)
+class PatternInfo:
+    nested: bool
+    broad: bool
+    repeats: bool
+    spans_lines: bool
+
+
+def _matches_newline(op, av, dotall):
+    if op == sre_constants.ANY:
+        return dotall
+    if op == sre_constants.LITERAL:
+        return av == _NEWLINE
+    if op == sre_constants.NOT_LITERAL:
+        return av != _NEWLINE
+    if op == sre_constants.IN:
+        negate = any(item_op == sre_constants.NEGATE for item_op, _ in av)
+        hit = any(
+            (item_op == sre_constants.LITERAL and item_av == _NEWLINE)
+            or (item_op == sre_constants.RANGE and item_av[0] <= _NEWLINE <= item_av[1])
+            or (item_op == sre_constants.CATEGORY and item_av in _NEWLINE_CATEGORIES)
+            for item_op, item_av in av
+        )
+        return hit != negate
+    if op == sre_constants.CATEGORY:
+        return av in _NEWLINE_CATEGORIES
+    return False
+
+
+def _is_broad(items):
+    # Look through single-item groups: ``(.)+`` and ``(?:[^x])*`` are ``.+`` and ``[^x]*``.
+    while len(items) == 1 and items[0][0] == sre_constants.SUBPATTERN:
+        items = list(items[0][1][3])
+    if len(items) != 1:
+        return False
+    op, av = items[0]
+    if op in (sre_constants.ANY, sre_constants.NOT_LITERAL):
+        return True
+    if op == sre_constants.IN:
+        return any(
+            item_op == sre_constants.NEGATE or (item_op == sre_constants.CATEGORY and item_av in _BROAD_CATEGORIES)
+            for item_op, item_av in av
+        )
+    return False
+
+
+@functools.lru_cache(maxsize=None)
+def analyse(pattern):
+    """Describe the backtracking risks of ``pattern`` (parsed once per pattern)."""
+    parsed = sre_parse.parse(pattern)
+    info = {"nested": False, "broad": False, "repeats": False, "spans_lines": False}
+
+    def walk(items, dotall, unbounded_depth):
+        for op, av in items:
+            if op in _REPEATS:
+                low, high, sub = av
+                unbounded = high == sre_constants.MAXREPEAT
+                if high > 1 and not all(sub_op == sre_constants.LITERAL for sub_op, _ in sub):
+                    info["repeats"] = True
+                if unbounded and unbounded_depth:
+                    info["nested"] = True
+                if unbounded and _is_broad(list(sub)):
+                    info["broad"] = True
+                walk(sub, dotall, unbounded_depth + unbounded)
+            elif op == sre_constants.SUBPATTERN:
+                _, add_flags, del_flags, sub = av
+                local = (dotall or add_flags & re.DOTALL) and not del_flags & re.DOTALL
+                walk(sub, bool(local), unbounded_depth)
+            elif op == sre_constants.BRANCH:
+                for branch in av[1]:
+                    walk(branch, dotall, unbounded_depth)
+            elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+                info["spans_lines"] = True
+                walk(av[1], dotall, unbounded_depth)
+            elif op == getattr(sre_constants, "ATOMIC_GROUP", None):
+                walk(av, dotall, unbounded_depth)
+            elif op == sre_constants.GROUPREF_EXISTS:
+                walk(av[1], dotall, unbounded_depth)
+                if av[2]:
+                    walk(av[2], dotall, unbounded_depth)
+            elif op == sre_constants.AT:
+                if av not in _LINE_SAFE_AT:
+                    info["spans_lines"] = True
+            elif _matches_newline(op, av, dotall):
+                info["spans_lines"] = True
+
+    walk(parsed, bool(parsed.state.flags & re.DOTALL), 0)
+    return PatternInfo(**info)
+
+
+_BROAD_ATOM_RE = re.compile(r"\.|\\[SWDs]|\[\^(?:\\.|[^\]\\])*\]")
+_GROUP_OPEN_RE = re.compile(r"\((?:\?:|\?P<\w+>)?")
+_UNBOUNDED_RE = re.compile(r"\*|\+|\{(\d*),\}")
+
+
+def _broad_atom(pattern, index):
+    """End of a broad atom at ``index``, possibly wrapped in single-item groups, or ``None``."""
+    depth = 0
+    while True:
+        opening = _GROUP_OPEN_RE.match(pattern, index)
+        if not opening:
+            break
+        depth += 1
+        index = opening.end()
+    atom = _BROAD_ATOM_RE.match(pattern, index)
+    if not atom:
+        return None
+    index = atom.end()
+    if pattern[index:index + depth] != ")" * depth:
+        return None
+    return index + depth
+
+
+def bound_repeats(pattern, limit=DEFAULT_REPEAT_LIMIT):
+    """Give an upper bound to unbounded repeats (``*``, ``+``, ``{n,}``) of broad atoms.
+
+    ``.+`` becomes ``.{1,limit}``, ``(?:[^x])*`` becomes ``(?:[^x]){0,limit}`` and
+    ``\\S{2,}`` becomes ``\\S{2,limit}``.
+    """
+    output = []
+    index = 0
+    in_class = False
+    while index < len(pattern):
+        end = None if in_class else _broad_atom(pattern, index)
+        if end is not None:
+            output.append(pattern[index:end])
+            index = end
+            repeat = _UNBOUNDED_RE.match(pattern, index)
+            if repeat:
+                low = {"*": 0, "+": 1}.get(repeat.group(0)) or int(repeat.group(1) or 0)
+                output.append(f"{{{low},{max(low, limit)}}}")
+                index = repeat.end()
+            continue
+        char = pattern[index]
+        if char == "\\":
+            output.append(pattern[index:index + 2])
+            index += 2
+        elif in_class:
+            output.append(char)
+            in_class = char != "]"
+            index += 1
+        elif char == "[":
+            # A "]" right after "[" or "[^" is a literal member of the class.
+            opening = re.match(r"\[\^?\]?", pattern[index:]).group(0)
+            output.append(opening)
+            in_class = True
+            index += len(opening)
+        else:
+            output.append(char)
+            index += 1
+    return "".join(output)
+
+
+def check_rule(rule, limit=DEFAULT_REPEAT_LIMIT):
+    """Return the (possibly rewritten) rule and a finding, or ``None`` when safe."""
+    if rule.kind != "regex":
+        return rule, None
+    info = analyse(rule.pattern)
+    if info.nested:
+        return rule, SafetyFinding(rule, "rejected", "nested unbounded repeats can backtrack exponentially")
+    if not info.broad:
+        return rule, None
+    bounded = bound_repeats(rule.pattern, limit)
+    if bounded == rule.pattern or analyse(bounded).broad:
+        return rule, SafetyFinding(rule, "rejected", "unbounded broad repeat that cannot be rewritten")
+    rewritten = replace(rule, pattern=bounded)
+    return rewritten, SafetyFinding(rewritten, "rewritten", f"unbounded repeat bounded: {bounded!r}")
+
+
+def check_rules(rules, limit=DEFAULT_REPEAT_LIMIT):
+    """Rewrite the risky regex rules; raise ``UnsafePatternError`` if any is rejected.
+
+    Returns the checked rules and the findings (rewrites).
+    """
+    checked, findings = [], []
+    for rule in rules:
+        rule, finding = check_rule(rule, limit)
+        checked.append(rule)
+        if finding:
+            findings.append(finding)
+    rejected = [finding for finding in findings if finding.status == "rejected"]
+    if rejected:
+        raise UnsafePatternError(rejected)
+    return checked, findings
+
+
+def needs_line_checks(rule):
+    """Whether a regex rule may still backtrack and can be applied line by line."""
+    if rule.kind != "regex":
+        return False
+    info = analyse(rule.pattern)
+    return info.repeats and not info.spans_lines
+
+
+def apply_by_line(content, rule, budget, path, started):
+    """Apply a single-line regex rule line by line, checking the rule budget between lines."""
+    regex = re.compile(rule.pattern)
+    lines = content.split("\n")
+    changed = False
+    for index, line in enumerate(lines):
+        if regex.search(line):
+            lines[index] = regex.sub(rule.replacement, line)
+            changed = True
+        elapsed = time.perf_counter() - started
+        if budget.per_rule is not None and elapsed > budget.per_rule:
+            raise BudgetExceeded("rule", rule.source, path, elapsed, budget.per_rule, index + 1, line)
+    return "\n".join(lines) if changed else content
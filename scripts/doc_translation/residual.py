@@ -0,0 +1,14 @@
+"""Residual French check, as printed at the end of the legacy scripts."""
+
+import re
+from collections import Counter
+
+FRENCH_WORDS_RE = re.compile(
+    r"\b(utilisateur|données|méthode|propriété|fonction|retourne|obtient|définit|calcule|valide|enregistre|français)\b",
+    re.IGNORECASE,
+)
+
+
+def residual_french(content):
+    """Return ``{word: occurrences}`` of the common French words left in ``content``."""
+    return dict(Counter(match.group(0) for match in FRENCH_WORDS_RE.finditer(content)))
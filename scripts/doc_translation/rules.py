@@ -0,0 +1,148 @@
+"""Load the translation tables of the legacy scripts as ordered rules."""
+
+import ast
+import re
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable, Union
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+Replacement = Union[str, Callable[[re.Match], str]]
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A single French -> English replacement.
+
+    ``kind`` is ``"literal"`` (plain ``str.replace``) or ``"regex"`` (``re.sub``).
+    ``source`` points back at the table entry, e.g. ``translate_final_cleanup.py:47``.
+    ``expression`` keeps the source code of a callable replacement.
+    """
+
+    pattern: str
+    replacement: Replacement
+    kind: str
+    source: str
+    ignore_case: bool = False
+    expression: str = ""
+
+
+@dataclass(frozen=True)
+class LegacyScript:
+    """How one legacy script stores and applies its table."""
+
+    filename: str
+    table: str
+    kind: str
+    encoding: str
+
+
+# Order in which the legacy scripts were run on csharp.documentation.instructions.md.
+LEGACY_SEQUENCE = (
+    LegacyScript("translate_csharp_doc_to_english.py", "translations", "literal", "utf-8"),
+    LegacyScript("translate_csharp_doc_complete.py", "translations", "literal", "utf-8"),
+    LegacyScript("translate_code_examples.py", "translations", "regex", "utf-8-sig"),
+    LegacyScript("final_complete_translation.py", "final_translations", "literal", "utf-8-sig"),
+    LegacyScript("translate_final_cleanup.py", "final_translations", "regex", "utf-8-sig"),
+)
+
+
+def _table_node(tree, name):
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == name for target in node.targets
+        ):
+            return node.value
+    raise LookupError(f"no '{name}' table found")
+
+
+def _entries(node):
+    if isinstance(node, ast.Dict):
+        return zip(node.keys, node.values)
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return ((item.elts[0], item.elts[1]) for item in node.elts)
+    raise TypeError(f"unsupported table literal: {type(node).__name__}")
+
+
+def compile_replacement(expression, filename="<glossary>"):
+    """Evaluate the source of a callable replacement (a lambda using at most ``re``)."""
+    node = ast.parse(expression, filename, mode="eval").body
+    if not isinstance(node, ast.Lambda):
+        raise ValueError(f"{filename}: only lambda replacements are supported")
+    code = compile(ast.Expression(node), filename, "eval")
+    return eval(code, {"__builtins__": {}, "re": re})
+
+
+def _evaluate(node, filename, source):
+    if isinstance(node, ast.Lambda):
+        # Callable replacements (see translate_final_cleanup.py) are the only code we evaluate.
+        return compile_replacement(ast.get_source_segment(source, node), filename)
+    return ast.literal_eval(node)
+
+
+def load_script_rules(script, scripts_dir=SCRIPTS_DIR):
+    """Parse the table of one legacy script without running the script itself."""
+    path = Path(scripts_dir) / script.filename
+    source = path.read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=str(path))
+    table = _table_node(tree, script.table)
+    rules = {}
+    for key, value in _entries(table):
+        pattern = _evaluate(key, script.filename, source)
+        rule = Rule(
+            pattern=pattern,
+            replacement=_evaluate(value, script.filename, source),
+            kind=script.kind,
+            source=f"{script.filename}:{key.lineno}",
+            expression=ast.get_source_segment(source, value) if isinstance(value, ast.Lambda) else "",
+        )
+        # Like a dict literal, a repeated key keeps its first position (and line)
+        # and its last value.
+        slot = pattern if isinstance(table, ast.Dict) else len(rules)
+        if slot in rules:
+            rule = replace(rule, source=rules[slot].source)
+        rules[slot] = rule
+    return list(rules.values())
+
+
+def load_legacy_rules(scripts_dir=SCRIPTS_DIR, sequence=LEGACY_SEQUENCE):
+    """Return every rule of the legacy sequence, in application order."""
+    rules = []
+    for script in sequence:
+        rules.extend(load_script_rules(script, scripts_dir))
+    return rules
+
+
+POWERSHELL_SCRIPT = "translate-doc-to-english.ps1"
+
+_PS_TABLE_START_RE = re.compile(r"^\s*\$translations\s*=\s*@\{")
+_PS_ENTRY_RE = re.compile(r'^\s*"((?:[^"]|"")*)"\s*=\s*"((?:[^"]|"")*)"\s*$')
+
+
+def load_powershell_rules(scripts_dir=SCRIPTS_DIR, filename=POWERSHELL_SCRIPT):
+    """Parse the ``$translations`` hashtable of the PowerShell script.
+
+    The script applies each key with ``-replace [regex]::Escape($key)``, i.e. a
+    case-insensitive literal replacement. PowerShell enumerates a hashtable in
+    hash order; rules are returned in file order.
+    """
+    lines = (Path(scripts_dir) / filename).read_text(encoding="utf-8").splitlines()
+    rules = []
+    inside = False
+    for lineno, line in enumerate(lines, 1):
+        if not inside:
+            inside = bool(_PS_TABLE_START_RE.match(line))
+            continue
+        if line.strip() == "}":
+            break
+        match = _PS_ENTRY_RE.match(line)
+        if match:
+            rules.append(Rule(
+                pattern=match.group(1).replace('""', '"'),
+                replacement=match.group(2).replace('""', '"'),
+                kind="literal",
+                source=f"{filename}:{lineno}",
+                ignore_case=True,
+            ))
+    return rules
@@ -0,0 +1,226 @@
+"""
+Deterministic sharded runs and mergeable result bundles.
+
+``--shard i/N`` (0-based, as ``JOB_COMPLETION_INDEX`` in a Kubernetes Indexed
+Job) selects the files of shard ``i``: every shard computes the same partition,
+balanced by file size with a stable path hash as tie-breaker. A shard writes
+nothing to the corpus; it produces a self-contained JSON bundle (edits, metrics,
+residual French report). ``merge`` checks that the N bundles are complete and
+that their file lists partition the corpus exactly (checkouts that differ, e.g.
+CRLF versus LF, give different partitions), applies their edits, repairs the
+links and writes the combined report.
+"""
+
+import hashlib
+import json
+import time
+from collections import Counter
+from pathlib import Path
+
+from .corpus import (
+    DEFAULT_PATTERNS,
+    CorpusReport,
+    DocumentResult,
+    iter_files,
+    read_text,
+    relative,
+    rewrite_corpus_links,
+    translate_document,
+    write_text,
+)
+from .domains import as_glossary
+from .regex_safety import BudgetExceeded
+from .residual import residual_french
+
+BUNDLE_VERSION = 2
+
+
+def parse_shard(text):
+    """Parse ``"i/N"`` into ``(i, N)`` with ``0 <= i < N``."""
+    try:
+        index, count = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise ValueError(f"invalid shard {text!r}, expected i/N") from None
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"invalid shard {text!r}, expected 0 <= i < N")
+    return index, count
+
+
+def stable_hash(path):
+    """Hash of a relative path, identical on every machine and Python run."""
+    return int.from_bytes(hashlib.sha1(path.encode("utf-8")).digest()[:8], "big")
+
+
+def partition(sizes, count):
+    """Split ``{path: size}`` into ``count`` lists of paths of similar total size.
+
+    Largest files first, each to the lightest shard (lowest index on ties); equal
+    sizes are ordered by stable path hash, so the result only depends on the input.
+    """
+    shards = [[] for _ in range(count)]
+    loads = [0] * count
+    for path in sorted(sizes, key=lambda p: (-sizes[p], stable_hash(p), p)):
+        lightest = min(range(count), key=lambda i: (loads[i], i))
+        shards[lightest].append(path)
+        loads[lightest] += sizes[path]
+    return [sorted(paths) for paths in shards]
+
+
+def shard_files(root, index, count, patterns=DEFAULT_PATTERNS):
+    root = Path(root)
+    sizes = {relative(root, path): path.stat().st_size for path in iter_files(root, patterns)}
+    return partition(sizes, count)[index]
+
+
+def _sha256(content):
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _budget_error(error):
+    return {
+        "path": error.path,
+        "scope": error.scope,
+        "rule": error.source,
+        "line": error.line,
+        "excerpt": error.excerpt[:200],
+        "seconds": round(error.elapsed, 3),
+        "limit": error.limit,
+    }
+
+
+def run_shard(root, glossary, index, count, patterns=DEFAULT_PATTERNS, budget=None):
+    """Translate the files of one shard; return its result bundle (a JSON-ready dict).
+
+    Files going over ``budget`` are left untranslated and listed in ``budget_errors``.
+    """
+    root = Path(root)
+    glossary = as_glossary(glossary)
+    started = time.perf_counter()
+    files = shard_files(root, index, count, patterns)
+    edits, residual, budget_errors = [], {}, []
+    size = 0
+    for name in files:
+        content = read_text(root / name)
+        size += len(content)
+        try:
+            result = translate_document(name, content, glossary.rules_for(name), budget)
+        except BudgetExceeded as error:
+            budget_errors.append(_budget_error(error))
+            result = None
+        if result is not None:
+            edits.append({
+                "path": name,
+                "original_sha256": _sha256(content),
+                "content": result.content,
+                "fired": result.fired,
+                "renames": result.renames,
+                "links": [[line, kind, links] for (line, kind), links in result.links.items()],
+            })
+        remaining = residual_french(result.content if result else content)
+        if remaining:
+            residual[name] = remaining
+    return {
+        "version": BUNDLE_VERSION,
+        "shard": [index, count],
+        "patterns": list(patterns),
+        "files": files,
+        "edits": edits,
+        "metrics": {
+            "files": len(files),
+            "characters": size,
+            "translated": len(edits),
+            "rules_applied": sum(len(edit["fired"]) for edit in edits),
+            "seconds": round(time.perf_counter() - started, 3),
+        },
+        "residual": residual,
+        "budget_errors": budget_errors,
+    }
+
+
+def save_bundle(path, bundle):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(bundle, f, ensure_ascii=False)
+
+
+def load_bundles(paths):
+    """Load the bundles of one run and check every shard is present exactly once."""
+    bundles = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            bundle = json.load(f)
+        if bundle.get("version") != BUNDLE_VERSION:
+            raise ValueError(f"{path}: unsupported bundle version {bundle.get('version')!r}")
+        bundles.append(bundle)
+    counts = {bundle["shard"][1] for bundle in bundles}
+    if len(counts) != 1:
+        raise ValueError(f"bundles come from different shard counts: {sorted(counts)}")
+    count = counts.pop()
+    indices = sorted(bundle["shard"][0] for bundle in bundles)
+    if indices != list(range(count)):
+        missing = sorted(set(range(count)) - set(indices))
+        raise ValueError(f"expected shards 0..{count - 1}, missing {missing}, got {indices}")
+    patterns = {tuple(bundle["patterns"]) for bundle in bundles}
+    if len(patterns) != 1:
+        raise ValueError(f"bundles come from different corpus patterns: {sorted(patterns)}")
+    return sorted(bundles, key=lambda bundle: bundle["shard"][0])
+
+
+def check_partition(root, bundles):
+    """Check the bundles' file lists cover the corpus under ``root`` exactly once."""
+    seen = Counter(name for bundle in bundles for name in bundle["files"])
+    corpus = {relative(root, path) for path in iter_files(root, bundles[0]["patterns"])}
+    duplicated = sorted(name for name, count in seen.items() if count > 1)
+    missing = sorted(corpus - set(seen))
+    unknown = sorted(set(seen) - corpus)
+    if duplicated or missing or unknown:
+        raise ValueError(
+            "shard file lists do not partition the corpus (shards run on different checkouts?): "
+            f"duplicated {duplicated}, missing {missing}, not in the corpus {unknown}"
+        )
+
+
+def merge_bundles(root, bundles, dry_run=False):
+    """Apply the edits of all bundles, then repair links across the whole corpus.
+
+    Edits whose file changed since the shard read it are skipped and reported as
+    conflicts. Returns the ``CorpusReport`` and the combined JSON report. Raises
+    ``ValueError`` when the bundles' file lists do not partition the corpus.
+    """
+    root = Path(root)
+    check_partition(root, bundles)
+    report = CorpusReport()
+    pending, conflicts = {}, []
+    for bundle in bundles:
+        for edit in bundle["edits"]:
+            path = root / edit["path"]
+            if _sha256(read_text(path)) != edit["original_sha256"]:
+                conflicts.append(edit["path"])
+                continue
+            report.add(DocumentResult(
+                path=edit["path"],
+                content=edit["content"],
+                fired=edit["fired"],
+                renames=[tuple(rename) for rename in edit["renames"]],
+                links={(line, kind): [tuple(link) for link in links] for line, kind, links in edit["links"]},
+            ))
+            if dry_run:
+                pending[edit["path"]] = edit["content"]
+            else:
+                write_text(path, edit["content"])
+    rewrite_corpus_links(root, report, pending, dry_run)
+
+    metrics = {}
+    for bundle in bundles:
+        for key, value in bundle["metrics"].items():
+            metrics[key] = metrics.get(key, 0) + value
+    combined = {
+        "shards": len(bundles),
+        "metrics": metrics,
+        "shard_seconds": [bundle["metrics"]["seconds"] for bundle in bundles],
+        "conflicts": conflicts,
+        "links_rewritten": report.links_rewritten,
+        "anchors_renamed": len(report.anchors),
+        "residual": {path: words for bundle in bundles for path, words in sorted(bundle["residual"].items())},
+        "budget_errors": [error for bundle in bundles for error in bundle.get("budget_errors", [])],
+    }
+    return report, combined
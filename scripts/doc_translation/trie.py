@@ -0,0 +1,310 @@
+"""
+Compact array-backed trie for large translation memories.
+
+The trie is a radix tree over UTF-8 bytes, stored as flat little-endian arrays
+so it can be memory-mapped and used without unpickling anything:
+
+    header   magic, node count, label bytes, value count, value bytes
+    nodes    4 x uint32 per node: label start, label length << 16 | child count,
+             first child, value index + 1 (0: no value)
+    offsets  uint32 start of each value in the value blob (+ end sentinel)
+    labels   edge labels (UTF-8)
+    values   translations (UTF-8)
+
+Children of a node are contiguous and sorted by their first label byte. 100k
+short glossary entries take a few MB, most of it the text itself.
+
+``trie_rule(path)`` plugs a trie into a rule sequence: the engine then replaces
+every leftmost-longest key in a single pass over the document. Only whole words
+are replaced: a key starting (ending) with a word character does not match after
+(before) another word character, so ``le`` never rewrites ``table``.
+"""
+
+import csv
+import functools
+import mmap
+import re
+import struct
+import sys
+import xml.etree.ElementTree as ElementTree
+from array import array
+
+from .rules import Rule
+
+MAGIC = b"DTTRIE01"
+HEADER = struct.Struct("<8sIIII")
+NODE_FIELDS = 4
+XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+
+_WORD_RE = re.compile(r"\w")
+_ASCII_WORD = frozenset(b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_")
+
+
+def _char_before(data, position):
+    start = position - 1
+    while start > 0 and data[start] & 0xC0 == 0x80:
+        start -= 1
+    return bytes(data[max(start, 0):position]).decode("utf-8", "replace")
+
+
+def _char_at(data, position):
+    end = position + 1
+    while end < len(data) and data[end] & 0xC0 == 0x80:
+        end += 1
+    return bytes(data[position:end]).decode("utf-8", "replace")
+
+
+def _is_word(char):
+    return bool(char) and bool(_WORD_RE.match(char))
+
+
+def in_word(data, start, end):
+    """Whether the key ``data[start:end]`` touches a word character it is glued to."""
+    return (_is_word(_char_at(data, start)) and _is_word(_char_before(data, start))) or \
+        (_is_word(_char_before(data, end)) and _is_word(_char_at(data, end)))
+
+
+def iter_tmx(path, source_lang="fr", target_lang="en"):
+    """Stream ``(source, target)`` pairs from a TMX file, one ``<tu>`` at a time.
+
+    Each unit is cleared and detached from its parent once read, so memory stays
+    flat whatever the size of the file.
+    """
+    source_lang, target_lang = source_lang.lower(), target_lang.lower()
+    parents = []
+    for event, element in ElementTree.iterparse(path, events=("start", "end")):
+        if event == "start":
+            parents.append(element)
+            continue
+        parents.pop()
+        if element.tag != "tu":
+            continue
+        segments = {}
+        for variant in element.iter("tuv"):
+            lang = (variant.get(XML_LANG) or variant.get("lang") or "").lower()
+            segment = variant.find("seg")
+            if segment is not None:
+                segments[lang.split("-")[0]] = "".join(segment.itertext())
+        element.clear()
+        if parents:
+            parents[-1].remove(element)
+        if segments.get(source_lang) and target_lang in segments:
+            yield segments[source_lang], segments[target_lang]
+
+
+def iter_csv(path, source_column=0, target_column=1, header=False, delimiter=","):
+    """Stream ``(source, target)`` pairs from a CSV file."""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        if header:
+            next(reader, None)
+        for row in reader:
+            if len(row) > max(source_column, target_column) and row[source_column]:
+                yield row[source_column], row[target_column]
+
+
+class TrieBuilder:
+    """Collect entries (first translation of a key wins) and write the trie file."""
+
+    def __init__(self):
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, source, target):
+        if source:
+            self._entries.setdefault(source.encode("utf-8"), target.encode("utf-8"))
+
+    def update(self, pairs):
+        for source, target in pairs:
+            self.add(source, target)
+        return self
+
+    def write(self, path):
+        if sys.byteorder != "little":
+            raise OSError("trie files are little-endian; big-endian hosts are not supported")
+        keys = sorted(self._entries)
+        nodes = array("I")
+        offsets = array("I")
+        labels = bytearray()
+        values = bytearray()
+
+        # Breadth-first layout: (lo, hi, start, end) covers keys[lo:hi], which
+        # share keys[lo][:end]; the node label is keys[lo][start:end].
+        queue = [(0, len(keys), 0, 0)]
+        head = 0
+        node_count = 1
+        while head < len(queue):
+            lo, hi, start, end = queue[head]
+            head += 1
+            label = keys[lo][start:end] if lo < hi else b""
+            value = 0
+            if lo < hi and len(keys[lo]) == end:
+                offsets.append(len(values))
+                values += self._entries[keys[lo]]
+                value = len(offsets)
+                lo += 1
+            children = []
+            while lo < hi:
+                byte = keys[lo][end]
+                group_end = lo + 1
+                while group_end < hi and keys[group_end][end] == byte:
+                    group_end += 1
+                first, last = keys[lo], keys[group_end - 1]
+                common = end + 1
+                while common < min(len(first), len(last)) and first[common] == last[common]:
+                    common += 1
+                children.append((lo, group_end, end, common))
+                lo = group_end
+            nodes.extend((
+                len(labels),
+                (end - start) << 16 | len(children),
+                node_count if children else 0,
+                value,
+            ))
+            labels += label
+            queue.extend(children)
+            node_count += len(children)
+        offsets.append(len(values))
+
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, node_count, len(labels), len(offsets) - 1, len(values)))
+            f.write(nodes.tobytes())
+            f.write(offsets.tobytes())
+            f.write(labels)
+            f.write(values)
+        return node_count
+
+
+class Trie:
+    """Read-only trie backed by a memory-mapped file."""
+
+    def __init__(self, path):
+        if sys.byteorder != "little":
+            raise OSError("trie files are little-endian; big-endian hosts are not supported")
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, node_count, label_size, value_count, value_size = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a trie file")
+        view = memoryview(self._map)
+        position = HEADER.size
+        self._nodes = view[position:position + node_count * NODE_FIELDS * 4].cast("I")
+        position += node_count * NODE_FIELDS * 4
+        self._offsets = view[position:position + (value_count + 1) * 4].cast("I")
+        position += (value_count + 1) * 4
+        self._labels = view[position:position + label_size]
+        position += label_size
+        self._values = view[position:position + value_size]
+        self._first_bytes = {self._labels[self._nodes[child * NODE_FIELDS]] for child in self._children(0)}
+        self.size = len(self._map)
+        self.entries = value_count
+
+    def _children(self, node):
+        base = node * NODE_FIELDS
+        first = self._nodes[base + 2]
+        return range(first, first + (self._nodes[base + 1] & 0xFFFF)) if first else range(0)
+
+    def _child(self, node, byte):
+        children = self._children(node)
+        lo, hi = children.start, children.stop
+        nodes, labels = self._nodes, self._labels
+        while lo < hi:
+            middle = (lo + hi) // 2
+            first = labels[nodes[middle * NODE_FIELDS]]
+            if first < byte:
+                lo = middle + 1
+            elif first > byte:
+                hi = middle
+            else:
+                return middle
+        return None
+
+    def _value(self, index):
+        return bytes(self._values[self._offsets[index - 1]:self._offsets[index]])
+
+    def matches(self, data, position):
+        """Yield ``(end, value)`` of every key of ``data`` at ``position``, shortest first."""
+        nodes, labels = self._nodes, self._labels
+        node = 0
+        while position < len(data):
+            child = self._child(node, data[position])
+            if child is None:
+                return
+            base = child * NODE_FIELDS
+            start, length = nodes[base], nodes[base + 1] >> 16
+            if data[position:position + length] != labels[start:start + length]:
+                return
+            position += length
+            node = child
+            if nodes[base + 3]:
+                yield position, nodes[base + 3]
+
+    def longest_match(self, data, position):
+        """Return ``(end, value)`` of the longest key of ``data`` at ``position``, or ``None``."""
+        match = None
+        for match in self.matches(data, position):
+            pass
+        return match
+
+    def get(self, key):
+        data = key.encode("utf-8")
+        found = self.longest_match(data, 0)
+        if found and found[0] == len(data):
+            return self._value(found[1]).decode("utf-8")
+        return None
+
+    def iter_matches(self, text, whole_words=True):
+        """Yield ``(start, end, value)`` of the leftmost-longest keys in the UTF-8 bytes of ``text``.
+
+        With ``whole_words``, a candidate glued to a surrounding word character is
+        skipped (a shorter key at the same position may still match).
+        """
+        return self._iter_matches(text.encode("utf-8"), whole_words)
+
+    def _iter_matches(self, data, whole_words):
+        first_bytes = self._first_bytes
+        position = 0
+        while position < len(data):
+            byte = data[position]
+            # Only start matches on first bytes of keys, at character boundaries
+            # (and, for whole words, not in the middle of an ASCII word).
+            glued = whole_words and byte in _ASCII_WORD and position and data[position - 1] in _ASCII_WORD
+            if byte in first_bytes and byte & 0xC0 != 0x80 and not glued:
+                candidates = list(self.matches(data, position))
+                if whole_words:
+                    candidates = [c for c in candidates if not in_word(data, position, c[0])]
+                if candidates:
+                    end, value = candidates[-1]
+                    yield position, end, value
+                    position = end
+                    continue
+            position += 1
+
+    def replace_all(self, text, whole_words=True):
+        """Replace every leftmost-longest key occurrence of ``text`` in one pass."""
+        data = text.encode("utf-8")
+        output = bytearray()
+        copied = 0
+        matched = False
+        for start, end, value in self._iter_matches(data, whole_words):
+            output += data[copied:start]
+            output += self._value(value)
+            copied = end
+            matched = True
+        if not matched:
+            return text
+        output += data[copied:]
+        return output.decode("utf-8")
+
+
+@functools.lru_cache(maxsize=None)
+def open_trie(path):
+    """Memory-map a trie file once per process."""
+    return Trie(path)
+
+
+def trie_rule(path):
+    """A rule applying the whole trie glossary at its position in a rule sequence."""
+    return Rule(pattern=str(path), replacement="", kind="trie", source=str(path))